@@ -34,7 +34,10 @@ BIG_UINT = 'big_uint'
 DIRECT = 'direct'
 	
 # Sizes
-SAMPLES_PER_BUFFER = 1024   # Number of samples per buffer
+BUFFER_SIZE = 4096  # Target num bytes of signal binary per buffer
+MIN_SAMPLES_PER_BUFFER = 256   # Lower bound on samples per buffer
+MAX_SAMPLES_PER_BUFFER = 8192  # Upper bound on samples per buffer
+WRITE_BUFFER_SIZE = 1 << 20  # Num bytes buffered by the output stream
 BYTE_SIZE = 8    # Number of bits per byte
 INT32_SIZE = 4   # Number of bytes in a 32-bit integer
 INT24_SIZE = 3   # Number of bytes in a 24-bit integer
@@ -383,7 +386,8 @@ class BaseFileOut:
 		self.signalParams[CORE_KEY_FMT] = format
 		self.signalParams[CORE_KEY_NUM_CHANNELS] = int(numChannels)
 		self.signalParams[CORE_KEY_BIT_DEPTH] = int(bitDepth)
-		self.signalParams[CORE_KEY_BYTE_DEPTH] = int(bitDepth / BYTE_SIZE)
+		self.signalParams[CORE_KEY_BYTE_DEPTH] = \
+			self.signalParams[CORE_KEY_BIT_DEPTH] // BYTE_SIZE
 		self.signalParams[CORE_KEY_SAMPLE_RATE] = int(sampleRate)
 
 	# ------------------------------------------------------------------------
@@ -429,9 +433,11 @@ class BaseFileOut:
 		1) processedSampleNestedList  ==> A nested list of processed sample
 										  data.
 		
-		Returns a bytearray of the processed signal data.
+		Returns a memoryview of the processed signal data.  The view may
+		share a buffer that the next call to repack() overwrites, so it is
+		only valid until then; copy it with bytes() to keep it longer.
 		"""
-		return bytearray()
+		return memoryview(bytearray())
 	
 	# ------------------------------------------------------------------------
 	# ------------------------- END:  ABSTRACT OPERATIONS --------------------
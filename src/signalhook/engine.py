@@ -5,11 +5,10 @@ The plugin helper methods of the BaseEngine abstract class, and the
 .__init__() and .process() methods of the concrete Engine classes
 constitute the entirety of the core user API.
 """
-import math
 import copy
-import re
 import os
-from collections import deque
+import types
+from concurrent.futures import ThreadPoolExecutor
 from . import base_io as baseIO
 from . import wav_io as wavIO
 from . import enginehelper as helper
@@ -20,6 +19,11 @@ from . import enginehelper as helper
 # supported file types:
 WAV = 'WAV'
 
+# (lower case) file extensions of the supported file types
+FILE_EXTENSIONS = {
+	WAV: '.wav',
+}
+
 # options dictionary keys
 OUTPUT_FMT = 'output_format'
 OUTPUT_NUM_CHANNELS = 'output_num_channels'
@@ -27,10 +31,22 @@ OUTPUT_BIT_DEPTH = 'output_bit_depth'
 OUTPUT_SAMPLE_RATE = 'output_sample_rate'
 PLUGIN_FMT = 'plugin_format'
 PLUGIN_REACH_BACK = 'plugin_reach_back'
+BUFFER_MULTIPLIER = 'buffer_multiplier'
 
 # options default value
 DEFAULT = 'default'
 
+# options that are set to DEFAULT if not requested
+OPTION_DEFAULTS = {
+	OUTPUT_FMT: DEFAULT,
+	OUTPUT_NUM_CHANNELS: DEFAULT,
+	OUTPUT_BIT_DEPTH: DEFAULT,
+	OUTPUT_SAMPLE_RATE: DEFAULT,
+	PLUGIN_FMT: DEFAULT,
+	PLUGIN_REACH_BACK: DEFAULT,
+	BUFFER_MULTIPLIER: DEFAULT,
+}
+
 
 # <<<----- EXCEPTION CLASSES: ----->>>
 class InvalidInput(Exception):
@@ -77,35 +93,32 @@ class BaseEngine:
 		# Initialize instance vars
 		self.algorithm = algorithm
 		
-		if not options:
-			self.options = dict()
+		# Start from the defaults, then apply the requested options
+		self.options = dict(OPTION_DEFAULTS)
+		if options:
+			self.options.update(copy.deepcopy(options))
 		else:
-			self.options = copy.deepcopy(options)
-		
-		# If option not set, set to DEFAULT
-		defaultKeys = [
-			OUTPUT_FMT,
-			OUTPUT_NUM_CHANNELS,
-			OUTPUT_BIT_DEPTH,
-			OUTPUT_SAMPLE_RATE,
-			PLUGIN_FMT,
-			PLUGIN_REACH_BACK
-		]
-		for key in defaultKeys:
-			try:
-				self.options[key]
-			except KeyError:
-				self.options[key] = DEFAULT
+			pass
 		
 		# Replace specific default(s) in self.options dictionary:
 		defaultMap = {
 			PLUGIN_REACH_BACK: 0,
+			BUFFER_MULTIPLIER: 1,
 		}
 		for key in defaultMap:
 			if self.options[key] == DEFAULT:
 				self.options[key] = defaultMap[key]
 			else:
 				pass
+		# The buffer multiplier must be a whole number of buffer-fulls
+		bufferMultiplier = self.options[BUFFER_MULTIPLIER]
+		if isinstance(bufferMultiplier, bool) or \
+				not isinstance(bufferMultiplier, int) or bufferMultiplier < 1:
+			errorMsg = "{} must be an int >= 1, got {!r}".format(
+				BUFFER_MULTIPLIER, bufferMultiplier)
+			raise InvalidInput(errorMsg)
+		else:
+			pass
 
 		# Validate the input/output entities, create and initialize the input
 		# and output objects
@@ -120,19 +133,45 @@ class BaseEngine:
 			self.outputSignal.signalParams[baseIO.CORE_KEY_BIT_DEPTH]
 		self.readSigned = self.inputSignal.signalParams[baseIO.CORE_KEY_SIGNED]
 		self.writeSigned = self.outputSignal.signalParams[baseIO.CORE_KEY_SIGNED]
+		self.numChannels = \
+			self.inputSignal.signalParams[baseIO.CORE_KEY_NUM_CHANNELS]
+
+		# Size each buffer-full so that its binary stays close to
+		# baseIO.BUFFER_SIZE, keeping every pass over the buffer in cache.
+		# Algorithms with a high per-call cost can request larger
+		# buffer-fulls with the BUFFER_MULTIPLIER option.
+		blockAlign = \
+			self.inputSignal.signalParams[baseIO.CORE_KEY_BYTE_DEPTH] * \
+			self.inputSignal.signalParams[baseIO.CORE_KEY_NUM_CHANNELS]
+		self.samplesPerBuffer = self.options[BUFFER_MULTIPLIER] * \
+			max(baseIO.MIN_SAMPLES_PER_BUFFER, 
+				min(baseIO.MAX_SAMPLES_PER_BUFFER, 
+					baseIO.BUFFER_SIZE // blockAlign))
+		self.bufferSize = self.samplesPerBuffer * blockAlign # In bytes
 
-		# Create the reach back deque
+		# Create the reach back ring, which must hold the current
+		# buffer-full plus the reach back window.
 		if self.options[PLUGIN_REACH_BACK] > 0:
-			reachBackDequeLength = \
-				math.ceil(self.options[PLUGIN_REACH_BACK] / \
-					baseIO.SAMPLES_PER_BUFFER) + 1
+			ringLength = self.options[PLUGIN_REACH_BACK] + self.samplesPerBuffer
 		else:
-			reachBackDequeLength = 0
-		self.reachBackDeque = deque(deque(), reachBackDequeLength)
-		self.bufferLenDeque = deque(deque(), reachBackDequeLength)
+			ringLength = 0
+		self.reachBackRing = helper.ReachBackRing(ringLength, self.numChannels)
+		# One block of the correct zero (float, PCM signed, PCM unsigned),
+		# which flush() feeds to the algorithm after the end of the signal
+		if self.readFormat == baseIO.PCM and not self.readSigned:
+			zero = 2**(self.readBitDepth - 1)
+		elif self.readFormat == baseIO.PCM:
+			zero = 0
+		else:
+			zero = 0.0
+		self.flushZeroBlock = [zero] * self.numChannels
 		
-		# initialize the algorithm wrapper
-		self.algorithm_wrapper =  self.select_algorithm_wrapper()
+		# initialize the algorithm wrapper, bound to this engine
+		wrapper = self.select_algorithm_wrapper()
+		if wrapper:
+			self.algorithm_wrapper = types.MethodType(wrapper, self)
+		else:
+			self.algorithm_wrapper = None
 
 	# ------------------------------------------------------------------------
 	# --------------------------- ABSTRACT OPERATIONS ------------------------
@@ -170,98 +209,40 @@ class BaseEngine:
 		data conversions based on the input data format, requested plugin
 		data format, and the requested output data format.  This method
 		selects the correct algorithm_wrapper function based on those
-		initialization parameters.  The actual wrapper methods are defined
-		in the enginehelper module.
+		initialization parameters, from the table of wrapper methods
+		defined in the enginehelper module.
+		
+		PCM to PCM processing with the default algorithm uses a wrapper
+		that skips the (no-op) clipping pass.
 		"""
-		# Conditionally assign the algorithm_wrapper() function:
-		# If read format and write format are both float...
-		if self.readFormat == self.writeFormat and \
-			(self.readFormat == baseIO.FLOAT):
-			# ...and the algorithm works with floating point,
-			# simply pass to the algorithm.
-			if self.options[PLUGIN_FMT] == baseIO.FLOAT:
-				return helper.wrapper_fff
-			# ...but the algorithm works with PCM,
-			# convert to PCM, pass to algorithm, convert back to float.
-			elif self.options[PLUGIN_FMT] == baseIO.PCM:
-				return helper.wrapper_fpf
-		# If read format and write format are both PCM...
-		elif self.readFormat == self.writeFormat and \
-			(self.readFormat == baseIO.PCM):
-			# ...but the algorithm works with floating point,
-			# convert to float, pass to algorithm, convert back to PCM
-			if self.options[PLUGIN_FMT] == baseIO.FLOAT:
-				return helper.wrapper_pfp
-			# ...and the algorithm works with PCM...
-			elif self.options[PLUGIN_FMT] == baseIO.PCM:
-				# ...and the read data is unsigned...
-				if not self.readSigned:
-					return helper.wrapper_ppp_unsigned
-				# ...and the read data is signed...
-				else:
-					# ...if there is no conversion of format or int repr,
-					# simply pass to the algorithm.
-					if self.readBitDepth == self.writeBitDepth and \
-						self.readSigned == self.writeSigned:
-						return helper.wrapper_ppp_signed_no_conversion
-					# ...if there is such conversion,
-					# pass to the algorithm, then perform PCM-PCM conversion.
-					else:
-						return helper.wrapper_ppp_signed_conversion
-		# If read format is float and write format is PCM...
-		elif self.readFormat != self.writeFormat and \
-			(self.readFormat == baseIO.FLOAT):
-			# ...and the algorithm works with floating point,
-			# pass to the algorithm, then convert to PCM.
-			if self.options[PLUGIN_FMT] == baseIO.FLOAT:
-				return helper.wrapper_ffp
-			# ...and the algorithm works with PCM...
-			elif self.options[PLUGIN_FMT] == baseIO.PCM:
-				# ...and the write data is unsigned,
-				# convert to signed PCM, pass to algorithm, then to unsigned.
-				if not self.writeSigned:
-					return helper.wrapper_fpp_unsigned
-				# ...and the write data is signed,
-				# convert to PCM, then pass to the algorithm.
-				else:
-					return helper.wrapper_fpp_signed
-		# If read format is PCM and write format is float...
-		elif self.readFormat != self.writeFormat and \
-			(self.readFormat == baseIO.PCM):
-			# ...and the algorithm works with floating point,
-			# convert to float, then pass to the algorithm.
-			if self.options[PLUGIN_FMT] == baseIO.FLOAT:
-				return helper.wrapper_pff
-			# ...and the algorithm works with PCM...
-			elif self.options[PLUGIN_FMT] == baseIO.PCM:
-				# ...and the read file data is unsigned,
-				# convert to 2's compliment, pass to algorithm, then
-				# convert to float.
-				if not self.readSigned:
-					return helper.wrapper_ppf_unsigned
-				# ...and the read file data is already 2's compliment,
-				# pass to the algorithm, then convert to float.
-				else:
-					return helper.wrapper_ppf_signed
+		key = (self.readFormat, 
+			   self.options[PLUGIN_FMT], 
+			   self.writeFormat, 
+			   self.readSigned, 
+			   self.writeSigned, 
+			   self.readBitDepth == self.writeBitDepth)
+		if self.algorithm is helper.default_algorithm and \
+				key[:3] == (baseIO.PCM, baseIO.PCM, baseIO.PCM):
+			return helper.wrapper_ppp_default
+		else:
+			return helper.WRAPPER_TABLE.get(key)
 	
 	def update_reachback_deques(self, sampleNestedList):
 		"""
-		Appends a copy of sampleNestedList to the reachBackDeque,
-		and appends the length of the nested list to the bufferLenDeque.
+		Pushes the currently processing buffer-full of samples onto
+		the reachBackRing.
 		
 		Accepts:
 		
-		1) sampleNestedList  ==>  The nested list of samples to append
-								  to the reachBackDeque.
+		1) sampleNestedList  ==>  The nested list of samples to push
+								  onto the reachBackRing.
 		"""
-		self.reachBackDeque.append(copy.deepcopy(sampleNestedList))
-		self.bufferLenDeque.append(len(sampleNestedList))
+		self.reachBackRing.push(sampleNestedList)
 	
 	# ------------------------------------------------------------------------
 	# ------------------------ PLUGIN HELPER METHODS -------------------------
 	# ------------------------------------------------------------------------
 	
-	# TIME ISSUE: takes way too long, need to revise...
 	def reach_back(self, numSamples, currBlock, currChannel):
 		"""
 		A plugin helper method that returns the sample from the 
@@ -272,36 +253,24 @@ class BaseEngine:
 		
 		Accepts:
 		
-		1) numSamples  ==>  The number of samples to reach back.
+		1) numSamples  ==>  The number of samples to reach back.  May be
+							at most the PLUGIN_REACH_BACK option.
 		
 		2) currBlock   ==>  The index of the reference block.
 		
 		3) currChannel ==>  The index of the reference channel.
 		
-		Returns the value of the reachBack sample.
+		Returns the value of the reachBack sample.  Raises InvalidInput
+		if numSamples is greater than the PLUGIN_REACH_BACK option.
 		"""
-		# Calculate the number of preceeding samples
-		preceedingSamples = -self.bufferLenDeque[-1]
-		for bufferLen in self.bufferLenDeque:
-			preceedingSamples += bufferLen
-		preceedingSamples += currBlock
-		# If attempting to reach back further than start of file,
-		# then return a value of zero
-		if numSamples > preceedingSamples:
-			return 0
+		if numSamples > self.options[PLUGIN_REACH_BACK]:
+			errorMsg = "cannot reach back {} samples, {} is {}".format(
+				numSamples, PLUGIN_REACH_BACK, 
+				self.options[PLUGIN_REACH_BACK])
+			raise InvalidInput(errorMsg)
 		else:
-			# *negative* reachBack total index = \
-			# 	(curr *negative* position) - numSamples
-			rbIndex = currBlock - self.bufferLenDeque[-1] - numSamples
-			# Find the correct buffer in deque 
-			index1 = 0
-			for i in range(1, len(self.bufferLenDeque)+1):
-				index1 -= 1
-				rbIndex += self.bufferLenDeque[-i]
-				if rbIndex >= 0:
-					break
-			# Return the desired sample
-			return self.reachBackDeque[index1][rbIndex][currChannel]
+			pass
+		return self.reachBackRing.get(numSamples, currBlock, currChannel)
 	
 	# ------------------------------------------------------------------------
 	# ---------------------- END: PLUGIN HELPER METHODS ----------------------
@@ -351,12 +320,8 @@ class FileToFileEngine(BaseEngine):
 			pass
 		
 		# <<<--- INSTANTIATION, INITIALIZATION --->>>
-		# regex search patterns for all valid file extensions
-		validFileExt = {
-			WAV: r'.*[.]wav$',
-		}
 		# instantiate correct signal input class:
-		if re.search(validFileExt[WAV], inputEntity):
+		if inputEntity.lower().endswith(FILE_EXTENSIONS[WAV]):
 			self.inputSignal = wavIO.WavIn(inputEntity)
 		else:
 			errorMsg = "{} file type not supported".format(inputEntity)
@@ -378,7 +343,7 @@ class FileToFileEngine(BaseEngine):
 			else:
 				pass
 		# instantiate correct signal output class:
-		if re.search(validFileExt[WAV], outputEntity):
+		if outputEntity.lower().endswith(FILE_EXTENSIONS[WAV]):
 			self.outputSignal = wavIO.WavOut(
 				outputEntity, 
 				self.options[OUTPUT_FMT],
@@ -399,34 +364,50 @@ class FileToFileEngine(BaseEngine):
 		file.
 		"""
 		with open(self.inputSignal.targetFile, 'rb') as readStream:
-			with open(self.outputSignal.targetFile, 'wb') as writeStream:
+			with open(self.outputSignal.targetFile, 'wb', 
+					  buffering=baseIO.WRITE_BUFFER_SIZE) as writeStream:
 				# Write header of output
 				self.outputSignal.write_header(writeStream)
 				# Set read stream to beginning of data
-				readStream.seek(0)
-				self.byteArray = readStream.read(self.inputSignal.headerLen)
+				readStream.seek(self.inputSignal.headerLen)
 					
 				# Expose a nested list of samples to the callback function
 				# and write the processed data:
-				blockAlign = \
-					self.inputSignal.signalParams[baseIO.CORE_KEY_BYTE_DEPTH] * \
-					self.inputSignal.signalParams[baseIO.CORE_KEY_NUM_CHANNELS]
-				bufferSize = baseIO.SAMPLES_PER_BUFFER * blockAlign
-				while True:
-					byteArray = readStream.read(bufferSize)   # Read Data
-					if byteArray:
-						# Unpack binary
-						sampleNestedList = self.inputSignal.unpack(byteArray)
-						# EXECUTE CALLBACK
-						processedSampleNestedList = \
-							self.algorithm_wrapper(self, sampleNestedList)
-						# Pack processed data
-						processedByteArray = \
-							self.outputSignal.repack(processedSampleNestedList)
-						# Write processed buffer to file
-						writeStream.write(processedByteArray)
-					else:
-						break
+				bufferSize = self.bufferSize
+				# Double buffer the read: the next buffer-full is read in a
+				# background thread while the current one is processed.  The
+				# two buffers are allocated once and filled with readinto(),
+				# so no new bytes object is created per buffer-full.
+				readBuffers = [memoryview(bytearray(bufferSize)), 
+							   memoryview(bytearray(bufferSize))]
+				# Hoist the per-buffer operations out of the loop
+				readinto = readStream.readinto
+				unpack = self.inputSignal.unpack
+				algorithm_wrapper = self.algorithm_wrapper
+				repack = self.outputSignal.repack
+				write = writeStream.write
+				with ThreadPoolExecutor(max_workers=1) as reader:
+					submit = reader.submit
+					slot = 0
+					pendingRead = submit(readinto, readBuffers[slot])
+					while True:
+						numBytes = pendingRead.result()   # Read Data
+						if numBytes:
+							byteArray = readBuffers[slot][:numBytes]
+							slot ^= 1
+							pendingRead = submit(readinto, readBuffers[slot])
+							# Unpack binary
+							sampleNestedList = unpack(byteArray)
+							# EXECUTE CALLBACK
+							processedSampleNestedList = \
+								algorithm_wrapper(sampleNestedList)
+							# Pack processed data
+							processedByteArray = \
+								repack(processedSampleNestedList)
+							# Write processed buffer to file
+							write(processedByteArray)
+						else:
+							break
 				# Don't forget to flush()
 				self.flush(writeStream)
 	
@@ -447,39 +428,23 @@ class FileToFileEngine(BaseEngine):
 		if not self.options[PLUGIN_REACH_BACK]:
 			return
 		else:
-			# Set correct zero (float, PCM signed, PCM unsigned)
-			zero = None
-			if self.readFormat == baseIO.FLOAT:
-				zero = float(0)
-			elif self.readFormat == baseIO.PCM and \
-				self.readSigned == True:
-				zero = int(0)
-			elif self.readFormat == baseIO.PCM and \
-				self.readSigned == False:
-				zero = int(2**(self.readBitDepth - 1))
-			# Create a dummy nested list with all zeros
-			list = []
-			for i in range(self.inputSignal.signalParams[
-							baseIO.CORE_KEY_NUM_CHANNELS]):
-				list.append(copy.copy(zero))
-			nest = []
-			for i in range(self.options[PLUGIN_REACH_BACK]):
-				nest.append(copy.deepcopy(list))
-			# Feed the nest peacemeal into the algorith_wrapper()
-			counter = 0
-			while True:
-				if counter > len(nest):
-					break
-				else:
-					pass
-				bufferFull = nest[counter:
-								  (counter + baseIO.SAMPLES_PER_BUFFER)]
+			# Feed the algorithm_wrapper() reachBack blocks of zeros, one
+			# buffer-full at a time.  Each block is a fresh copy of the
+			# flushZeroBlock, because the wrapper and the algorithm may
+			# modify samples in place.
+			zeroBlock = self.flushZeroBlock
+			samplesPerBuffer = self.samplesPerBuffer
+			algorithm_wrapper = self.algorithm_wrapper
+			repack = self.outputSignal.repack
+			write = writeStream.write
+			remaining = self.options[PLUGIN_REACH_BACK]
+			while remaining > 0:
+				numBlocks = min(remaining, samplesPerBuffer)
+				bufferFull = [zeroBlock[:] for i in range(numBlocks)]
 				# Execute callback
-				processedSampleNestedList = \
-					self.algorithm_wrapper(self, bufferFull)
+				processedSampleNestedList = algorithm_wrapper(bufferFull)
 				# Pack processed data
-				processedByteArray = \
-					self.outputSignal.repack(processedSampleNestedList)
+				processedByteArray = repack(processedSampleNestedList)
 				# Write processed buffer to file
-				writeStream.write(processedByteArray)
-				counter += baseIO.SAMPLES_PER_BUFFER
+				write(processedByteArray)
+				remaining -= numBlocks
@@ -4,6 +4,12 @@ implementation of the Engine classes.
 """
 
 import math
+from itertools import chain, product
+from . import base_io as baseIO
+
+# Signed PCM (low, high) sample bounds, keyed by bit depth:
+PCM_BOUNDS = {bitDepth: (-(1 << (bitDepth - 1)), (1 << (bitDepth - 1)) - 1) 
+				for bitDepth in (8, 16, 24, 32)}
 
 def clip_pcm(sampleNestedList, bitDepth):
 	"""
@@ -16,14 +22,11 @@ def clip_pcm(sampleNestedList, bitDepth):
 		
 	2) bitDepth          ==>  The bit depth of the samples.
 	"""
-	for i in range(len(sampleNestedList)):
-		for x in range(len(sampleNestedList[i])):
-			if sampleNestedList[i][x] > ((2**(bitDepth - 1)) - 1):
-				sampleNestedList[i][x] = ((2**(bitDepth - 1)) - 1)
-			elif sampleNestedList[i][x] < -(2**(bitDepth - 1)):
-				sampleNestedList[i][x] = -(2**(bitDepth - 1))
-			else:
-				pass
+	low, high = PCM_BOUNDS[bitDepth]
+	sampleNestedList[:] = [
+		[high if sample > high else low if sample < low else sample 
+			for sample in block] 
+		for block in sampleNestedList]
 	return sampleNestedList
 	
 def clip_float(sampleNestedList):
@@ -35,14 +38,10 @@ def clip_float(sampleNestedList):
 	
 	1) sampleNestedList  ==>  The nested list of samples to clip.
 	"""
-	for i in range(len(sampleNestedList)):
-		for x in range(len(sampleNestedList[i])):
-			if sampleNestedList[i][x] > 1.0:
-				sampleNestedList[i][x] = 1.0
-			elif sampleNestedList[i][x] < -1.0:
-				sampleNestedList[i][x] = -1.0
-			else:
-				pass
+	sampleNestedList[:] = [
+		[1.0 if sample > 1.0 else -1.0 if sample < -1.0 else sample 
+			for sample in block] 
+		for block in sampleNestedList]
 	return sampleNestedList
 
 def float_to_pcm(sampleNestedList, bitDepth, signed):
@@ -60,18 +59,17 @@ def float_to_pcm(sampleNestedList, bitDepth, signed):
 	
 	Returns the converted nested list of samples.
 	"""
+	floor = math.floor
+	low, high = PCM_BOUNDS[bitDepth]
+	scale = (high - low) / 2
 	if signed:
-		for block in range(len(sampleNestedList)):
-			for channel in range(len(sampleNestedList[block])):
-				sampleNestedList[block][channel] = \
-					math.floor(sampleNestedList[block][channel] * \
-						(((2**bitDepth) - 1) / 2))
+		sampleNestedList[:] = [
+			[floor(sample * scale) for sample in block] 
+			for block in sampleNestedList]
 	else:
-		for block in range(len(sampleNestedList)):
-			for channel in range(len(sampleNestedList[block])):
-				sampleNestedList[block][channel] = \
-					math.floor((sampleNestedList[block][channel]+1) *
-						(((2**(bitDepth))-1)/2))
+		sampleNestedList[:] = [
+			[floor((sample + 1) * scale) for sample in block] 
+			for block in sampleNestedList]
 	return sampleNestedList
 
 def pcm_to_float(sampleNestedList, bitDepth, signed):
@@ -90,29 +88,35 @@ def pcm_to_float(sampleNestedList, bitDepth, signed):
 	Returns the converted nested list of samples.
 	"""
 	if signed:
-		for block in range(len(sampleNestedList)):
-			for channel in range(len(sampleNestedList[block])):
-				if sampleNestedList[block][channel] <= 0:
-					sampleNestedList[block][channel] = \
-						sampleNestedList[block][channel] / \
-						(2**(bitDepth - 1))
-				else:
-					sampleNestedList[block][channel] = \
-						(sampleNestedList[block][channel] / 
-						(2**(bitDepth - 1))) + \
-						(1 / (2**(bitDepth-1)))
+		# Negative full scale maps to -1.0, positive full scale to 1.0.
+		# (int / int is faster in CPython than int * float.)
+		fullScale = 1 << (bitDepth - 1)
+		step = 1 / fullScale
+		sampleNestedList[:] = [
+			[sample / fullScale if sample <= 0 
+				else (sample / fullScale) + step 
+				for sample in block] 
+			for block in sampleNestedList]
 	else:
-		for block in range(len(sampleNestedList)):
-			for channel in range(len(sampleNestedList[block])):
-				sampleNestedList[block][channel] = \
-					(((sampleNestedList[block][channel]) / 
-					(((2**(bitDepth))-1)/2)) - 1)
+		scale = ((1 << bitDepth) - 1) / 2
+		sampleNestedList[:] = [
+			[(sample / scale) - 1 for sample in block] 
+			for block in sampleNestedList]
 	return sampleNestedList
 
 def pcm_to_pcm(sampleNestedList, inBitDepth, outBitDepth, inSigned, 
 				outSigned):
 	"""
-	Converts to float, then converts pack to PCM at desired bit depth.
+	Converts PCM samples to the desired bit depth and signedness.  If
+	only the bit depth changes, the samples are shifted directly; if
+	only the signedness changes, they are offset directly.  Otherwise
+	they are converted to float, then back to PCM.  Non-int samples
+	are floored first in every case.
+	
+	NOTE: A shift keeps the most significant bits, so widening fills
+	the new low bits with zeros (16 to 24 bit maps 664 to 169984),
+	whereas float_to_pcm scales to the full output range (the same
+	sample read through a float plugin is written as 170239).
 	
 	Accepts:
 	
@@ -131,9 +135,103 @@ def pcm_to_pcm(sampleNestedList, inBitDepth, outBitDepth, inSigned,
 	
 	Returns the converted nested list of samples.
 	"""
+	floor = math.floor
+	# At equal bit depths, only the integer representation can differ,
+	# which is an exact offset of the whole buffer by 2**(bitDepth-1).
+	# (A PCM plugin may return non-int samples; floor them, as the
+	# conversion through float does.)
+	if inBitDepth == outBitDepth:
+		if inSigned == outSigned:
+			return sampleNestedList
+		elif inSigned:
+			offset = 1 << (inBitDepth - 1)
+		else:
+			offset = -(1 << (inBitDepth - 1))
+		sampleNestedList[:] = [[floor(sample) + offset for sample in block] 
+								for block in sampleNestedList]
+		return sampleNestedList
+	# At equal signedness, changing bit depth is a shift that keeps the
+	# most significant bits (low bits are dropped or zero-filled):
+	elif inSigned == outSigned:
+		if outBitDepth > inBitDepth:
+			shift = outBitDepth - inBitDepth
+			sampleNestedList[:] = [[floor(sample) << shift for sample in block] 
+									for block in sampleNestedList]
+		else:
+			shift = inBitDepth - outBitDepth
+			sampleNestedList[:] = [[floor(sample) >> shift for sample in block] 
+									for block in sampleNestedList]
+		return sampleNestedList
+	else:
+		pass
 	pcm_to_float(sampleNestedList, inBitDepth, inSigned)
 	return float_to_pcm(sampleNestedList, outBitDepth, outSigned)
 
+def clip_float_to_pcm(sampleNestedList, bitDepth, signed):
+	"""
+	Clips the (float) signal and converts it to PCM in a single pass
+	over the samples.  Equivalent to clip_float() followed by 
+	float_to_pcm().
+	
+	Accepts:
+	
+	1) sampleNestedList  ==>  The nested list of samples to convert.
+	
+	2) bitDepth          ==>  The bit depth of the output PCM.
+	
+	3) signed            ==>  A boolean indicating whether or not to
+							  convert to signed or unsigned PCM.
+	
+	Returns the converted nested list of samples.
+	"""
+	floor = math.floor
+	pcmLow, pcmHigh = PCM_BOUNDS[bitDepth]
+	scale = (pcmHigh - pcmLow) / 2
+	if signed:
+		high = floor(1.0 * scale)
+		low = floor(-1.0 * scale)
+		sampleNestedList[:] = [
+			[high if sample > 1.0 else low if sample < -1.0 
+				else floor(sample * scale) 
+				for sample in block] 
+			for block in sampleNestedList]
+	else:
+		high = floor(2.0 * scale)
+		low = 0
+		sampleNestedList[:] = [
+			[high if sample > 1.0 else low if sample < -1.0 
+				else floor((sample + 1) * scale) 
+				for sample in block] 
+			for block in sampleNestedList]
+	return sampleNestedList
+
+def clip_pcm_to_float(sampleNestedList, bitDepth):
+	"""
+	Clips the (signed PCM) signal and converts it to floating point in
+	a single pass over the samples.  Equivalent to clip_pcm() followed
+	by pcm_to_float() with signed=True.
+	
+	Accepts:
+	
+	1) sampleNestedList  ==>  The nested list of samples to convert.
+	
+	2) bitDepth          ==>  The bit depth of the input PCM.
+	
+	Returns the converted nested list of samples.
+	"""
+	low, high = PCM_BOUNDS[bitDepth]
+	fullScale = -low
+	step = 1 / fullScale
+	highFloat = (high / fullScale) + step
+	lowFloat = low / fullScale
+	sampleNestedList[:] = [
+		[highFloat if sample > high else lowFloat if sample < low 
+			else sample / fullScale if sample <= 0 
+			else (sample / fullScale) + step 
+			for sample in block] 
+		for block in sampleNestedList]
+	return sampleNestedList
+
 
 def default_algorithm(self, sampleNestedList):
 	"""
@@ -142,6 +240,86 @@ def default_algorithm(self, sampleNestedList):
 	"""
 	return sampleNestedList
 
+# --------------------------------------------------------------
+# ------------------------ REACH BACK RING: --------------------
+# --------------------------------------------------------------
+
+class ReachBackRing:
+	"""
+	Fixed-capacity ring of the most recent samples, used to implement
+	the Engine.reach_back() plugin helper.  The samples are stored in
+	one preallocated flat list (interleaved, numChannels per block),
+	and blocks are indexed by their absolute position in the signal,
+	so pushing a buffer-full is a slice copy and a lookup is O(1).
+	"""
+	def __init__(self, numBlocks, numChannels):
+		"""
+		Accepts:
+		
+		1) numBlocks    ==>  The capacity of the ring, in blocks.  Must
+							 cover the reach back window plus one
+							 buffer-full.  If zero, nothing is stored.
+		
+		2) numChannels  ==>  The number of samples per block.
+		"""
+		self.numBlocks = numBlocks
+		self.numChannels = numChannels
+		self.samples = [0] * (numBlocks * numChannels)
+		self.totalBlocks = 0     # Num blocks pushed onto the ring so far
+		self.currBufferStart = 0 # Absolute index of current buffer's 1st block
+		self.firstHeldBlock = 0  # Absolute index of oldest block in the ring
+	
+	def push(self, sampleNestedList):
+		"""
+		Copies the samples of sampleNestedList into the ring, and makes
+		it the current buffer-full.
+		
+		Accepts:
+		
+		1) sampleNestedList  ==>  The nested list of samples to push.
+		"""
+		if self.numBlocks:
+			ring = self.samples
+			samples = list(chain.from_iterable(sampleNestedList))
+			start = (self.totalBlocks % self.numBlocks) * self.numChannels
+			end = start + len(samples)
+			# Slice assignment copies the samples; wrap around if necessary
+			if end <= len(ring):
+				ring[start:end] = samples
+			else:
+				split = len(ring) - start
+				ring[start:] = samples[:split]
+				ring[:end - len(ring)] = samples[split:]
+		else:
+			pass
+		self.currBufferStart = self.totalBlocks
+		self.totalBlocks += len(sampleNestedList)
+		self.firstHeldBlock = max(0, self.totalBlocks - self.numBlocks)
+	
+	def get(self, numSamples, currBlock, currChannel):
+		"""
+		Returns the sample from currChannel that came numSamples before
+		block currBlock of the current buffer-full, or zero if that block
+		is not held by the ring: before the start of the signal, older
+		than the ring's capacity (numBlocks), or after the current
+		buffer-full.  A ring with no capacity always returns zero.
+		
+		Accepts:
+		
+		1) numSamples  ==>  The number of samples to reach back.
+		
+		2) currBlock   ==>  The index of the reference block.
+		
+		3) currChannel ==>  The index of the reference channel.
+		"""
+		# Absolute index of the reachBack block within the signal
+		rbIndex = self.currBufferStart + currBlock - numSamples
+		if self.firstHeldBlock <= rbIndex < self.totalBlocks:
+			return self.samples[
+				(rbIndex % self.numBlocks) * self.numChannels + currChannel]
+		else:
+			return 0
+
 # --------------------------------------------------------------
 # ---------------------- ALGORITHM WRAPPERS: -------------------
 # --------------------------------------------------------------
@@ -155,12 +333,13 @@ def default_algorithm(self, sampleNestedList):
 #   2) Cipping the output data after it is processed, but before it
 #      is returned.
 #
-#   3) Updating the Engine.reachBackDeque by pushing onto it the
+#   3) Updating the Engine.reachBackRing by pushing onto it the
 #      currently processing buffer-full of samples.
 #
 # The conversions are based on parameters of the input signal,
 # output signal, and the plugin environment, and the proper wrapper
-# is selected during initialization of the Engine object in the
+# is looked up in WRAPPER_TABLE (see the end of this module) during
+# initialization of the Engine object, in the
 # Engine.select_algorithm_wrapper() method.
 
 
@@ -189,8 +368,7 @@ def wrapper_fpf(engineObj, sampleNestedList):
 	preProcessedNest = float_to_pcm(sampleNestedList, 32, True)
 	engineObj.update_reachback_deques(preProcessedNest)
 	processedNest = engineObj.algorithm(engineObj, preProcessedNest)
-	clippedNest = clip_pcm(processedNest, 32)
-	return pcm_to_float(clippedNest, 32, True)
+	return clip_pcm_to_float(processedNest, 32)
 
 def wrapper_pfp(engineObj, sampleNestedList):
 	"""
@@ -205,10 +383,9 @@ def wrapper_pfp(engineObj, sampleNestedList):
 									engineObj.readSigned)
 	engineObj.update_reachback_deques(preProcessedNest)
 	processedNest = engineObj.algorithm(engineObj, preProcessedNest)
-	clippedNest = clip_float(processedNest)
-	return float_to_pcm(clippedNest, 
-						engineObj.writeBitDepth, 
-						engineObj.writeSigned)
+	return clip_float_to_pcm(processedNest, 
+							 engineObj.writeBitDepth, 
+							 engineObj.writeSigned)
 	
 def wrapper_ppp_unsigned(engineObj, sampleNestedList):
 	"""
@@ -277,10 +454,9 @@ def wrapper_ffp(engineObj, sampleNestedList):
 	"""
 	engineObj.update_reachback_deques(sampleNestedList)
 	processedNest = engineObj.algorithm(engineObj, sampleNestedList)
-	clippedNest = clip_float(processedNest)
-	return float_to_pcm(clippedNest, 
-						engineObj.writeBitDepth, 
-						engineObj.writeSigned)
+	return clip_float_to_pcm(processedNest, 
+							 engineObj.writeBitDepth, 
+							 engineObj.writeSigned)
 	
 
 def wrapper_fpp_unsigned(engineObj, sampleNestedList):
@@ -354,8 +530,7 @@ def wrapper_ppf_unsigned(engineObj, sampleNestedList):
 								  True)
 	engineObj.update_reachback_deques(preProcessedNest)
 	processedNest = engineObj.algorithm(engineObj, sampleNestedList)
-	clippedNest = clip_pcm(processedNest, engineObj.readBitDepth)
-	return pcm_to_float(clippedNest, engineObj.readBitDepth, True)
+	return clip_pcm_to_float(processedNest, engineObj.readBitDepth)
 	
 def wrapper_ppf_signed(engineObj, sampleNestedList):
 	"""
@@ -369,5 +544,89 @@ def wrapper_ppf_signed(engineObj, sampleNestedList):
 	"""	
 	engineObj.update_reachback_deques(sampleNestedList)
 	processedNest = engineObj.algorithm(engineObj, sampleNestedList)
-	clippedNest = clip_pcm(processedNest, engineObj.readBitDepth)
-	return pcm_to_float(processedNest, engineObj.readBitDepth, engineObj.readSigned)
+	return clip_pcm_to_float(processedNest, engineObj.readBitDepth)
+
+def wrapper_ppp_default(engineObj, sampleNestedList):
+	"""
+	Conditions:
+	
+	Read fmt = PCM, 
+	Plugin fmt = PCM,
+	write fmt = PCM
+	
+	Plugin algorithm = default_algorithm.
+	
+	NOTE: PCM samples read from the file are always in range, and the
+	default algorithm does not change them, so no clipping is needed.
+	"""
+	if not engineObj.readSigned:
+		sampleNestedList = pcm_to_pcm(sampleNestedList, 
+									  engineObj.readBitDepth, 
+									  engineObj.readBitDepth, 
+									  False, 
+									  True)
+	else:
+		pass
+	engineObj.update_reachback_deques(sampleNestedList)
+	return pcm_to_pcm(sampleNestedList, 
+					  engineObj.readBitDepth, 
+					  engineObj.writeBitDepth, 
+					  True, 
+					  engineObj.writeSigned)
+
+
+def build_wrapper_table():
+	"""
+	Builds the table from which Engine.select_algorithm_wrapper() picks
+	the algorithm_wrapper.  The table is keyed on the tuple:
+	
+	(read fmt, plugin fmt, write fmt, read signed, write signed, 
+	 read bit depth == write bit depth)
+	
+	Float data is always signed.
+	
+	Returns the table (a dictionary).
+	"""
+	FLOAT = baseIO.FLOAT
+	PCM = baseIO.PCM
+	table = dict()
+	for readSigned, writeSigned, sameBitDepth in product((True, False), 
+														 repeat=3):
+		# float -> float
+		table[(FLOAT, FLOAT, FLOAT, True, True, sameBitDepth)] = \
+			wrapper_fff
+		table[(FLOAT, PCM, FLOAT, True, True, sameBitDepth)] = \
+			wrapper_fpf
+		# PCM -> PCM
+		table[(PCM, FLOAT, PCM, readSigned, writeSigned, sameBitDepth)] = \
+			wrapper_pfp
+		if not readSigned:
+			table[(PCM, PCM, PCM, readSigned, writeSigned, sameBitDepth)] = \
+				wrapper_ppp_unsigned
+		elif writeSigned and sameBitDepth:
+			table[(PCM, PCM, PCM, readSigned, writeSigned, sameBitDepth)] = \
+				wrapper_ppp_signed_no_conversion
+		else:
+			table[(PCM, PCM, PCM, readSigned, writeSigned, sameBitDepth)] = \
+				wrapper_ppp_signed_conversion
+		# float -> PCM
+		table[(FLOAT, FLOAT, PCM, True, writeSigned, sameBitDepth)] = \
+			wrapper_ffp
+		if not writeSigned:
+			table[(FLOAT, PCM, PCM, True, writeSigned, sameBitDepth)] = \
+				wrapper_fpp_unsigned
+		else:
+			table[(FLOAT, PCM, PCM, True, writeSigned, sameBitDepth)] = \
+				wrapper_fpp_signed
+		# PCM -> float
+		table[(PCM, FLOAT, FLOAT, readSigned, True, sameBitDepth)] = \
+			wrapper_pff
+		if not readSigned:
+			table[(PCM, PCM, FLOAT, readSigned, True, sameBitDepth)] = \
+				wrapper_ppf_unsigned
+		else:
+			table[(PCM, PCM, FLOAT, readSigned, True, sameBitDepth)] = \
+				wrapper_ppf_signed
+	return table
+
+WRAPPER_TABLE = build_wrapper_table()
@@ -5,12 +5,15 @@ from .WAV files. The concrete classes WavIn and WavOut
 inherit from the abstract base_io.BaseFileIn and base_io.BaseFileOut 
 classes, respectively, and from WavBase, which contains  
 methods specific to .WAV files. Not all .WAV files are covered. This 
-module currently only supports 8- and 16-bit PCM and 32- 
+module currently only supports 8-, 16- and 24-bit PCM and 32- 
 and 64-bit floating point formats.
 """
 
+import sys
+import array
 import struct
-import math
+from operator import rshift
+from itertools import chain, repeat
 from . import base_io as baseIO
 
 
@@ -42,10 +45,18 @@ KEY_SUBCHUNK3_ID = 'subchunk3ID'
 KEY_SUBCHUNK3_SIZE = 'subchunk3Size'
 KEY_STRUCT_MULTIPLIER = 'structMultiplier'
 KEY_STRUCT_FMT_CHAR = 'structFmtChar'
+# Header layouts: the RIFF chunk header plus the fmt subchunk as far as
+# the bit depth, the fmt subchunk extension (cbSize, wValidBitsPerSample,
+# dwChannelMask, SubFormat), and a subchunk header (ID, size)
+RIFF_FMT_STRUCT = struct.Struct('<4sI4s4sIHHIIHH')
+FMT_EXT_STRUCT = struct.Struct('<HHIH14s')
+SUBCHUNK_HEAD_STRUCT = struct.Struct('<4sI')
+CB_SIZE_STRUCT = struct.Struct('<H')  # Extension size alone (18-byte fmt)
 # Sizes
 WAV_HEADER_SEARCH_LEN = 100  # Num bytes used to search for header chunk IDs
 WAV_CHUNK_SIZE_ADDITION = 4   # Num bytes in WAV file format header
 WAV_SUBCHUNK_HEAD_SIZE = 8  # Num bytes in a subchunk header
+UINT32_RANGE = 1 << 32  # Num values a 32-bit header field can hold
 FMT_CHUNK_SIZE_16 = 16  # Num bytes in PCM fmt subchunk
 FMT_CHUNK_SIZE_18 = 18  # Num bytes in non-PCM && non-extensible fmt subchunk
 FMT_CHUNK_SIZE_40 = 40  # Num bytes in extensible format fmt subchunk
@@ -71,6 +82,16 @@ WAV_FMT_FLOAT = 3 # Floating point data
 WAV_FMT_ALAW = 6  # A-law 8-bit data
 WAV_FMT_MULAW = 7 # Mu-law 8-bit data
 WAV_FMT_EXTENSIBLE = 61183 # Extensible format
+# Supported sample formats: (audio format code, byte depth) ->
+# (struct/array format char, signed).  24-bit samples are widened to
+# (and narrowed from) 32-bit ints.
+SAMPLE_FORMATS = {
+	(WAV_FMT_PCM, baseIO.INT8_SIZE): ('B', False),
+	(WAV_FMT_PCM, baseIO.INT16_SIZE): ('h', True),
+	(WAV_FMT_PCM, baseIO.INT24_SIZE): ('i', True),
+	(WAV_FMT_FLOAT, baseIO.FLOAT_SIZE): ('f', True),
+	(WAV_FMT_FLOAT, baseIO.DOUBLE_SIZE): ('d', True),
+}
 
 
 class WavBase:
@@ -81,24 +102,21 @@ class WavBase:
 	def init_struct_fmt_str(self):
 		"""
 		Initializes the multiplier and data type character for the struct
-		format string.  Called at the end of read_header() override.
+		format string, and whether the samples are signed, based on the
+		SAMPLE_FORMATS table.  Called at the end of read_header() and
+		init_header() overrides.
 		"""
 		self.signalParams[KEY_STRUCT_MULTIPLIER] = '' # initialize for later
+		self.repackStructs = dict() # (Struct, pack buffer, output buffer,
+									# memoryview of output) per buffer length
 		# Supported formats:
-		if self.signalParams[KEY_AUDIO_FMT] == WAV_FMT_PCM and \
-			self.signalParams[baseIO.CORE_KEY_BYTE_DEPTH] == baseIO.INT8_SIZE:
-			self.signalParams[KEY_STRUCT_FMT_CHAR] = 'B'
-		elif self.signalParams[KEY_AUDIO_FMT] == WAV_FMT_PCM and \
-			self.signalParams[baseIO.CORE_KEY_BYTE_DEPTH] == baseIO.INT16_SIZE:
-			self.signalParams[KEY_STRUCT_FMT_CHAR] = 'h'
-		elif self.signalParams[KEY_AUDIO_FMT] == WAV_FMT_FLOAT and \
-			self.signalParams[baseIO.CORE_KEY_BYTE_DEPTH] == baseIO.FLOAT_SIZE:
-			self.signalParams[KEY_STRUCT_FMT_CHAR] = 'f'
-		elif self.signalParams[KEY_AUDIO_FMT] == WAV_FMT_FLOAT and \
-			self.signalParams[baseIO.CORE_KEY_BYTE_DEPTH] == baseIO.DOUBLE_SIZE:
-			self.signalParams[KEY_STRUCT_FMT_CHAR] = 'd'
+		try:
+			self.signalParams[KEY_STRUCT_FMT_CHAR], \
+				self.signalParams[baseIO.CORE_KEY_SIGNED] = SAMPLE_FORMATS[(
+					self.signalParams[KEY_AUDIO_FMT], 
+					self.signalParams[baseIO.CORE_KEY_BYTE_DEPTH])]
 		# Else: raise IncompatibleFileFormat with format description
-		else:
+		except KeyError:
 			try:
 				fmtStr = self.signalParams[baseIO.CORE_KEY_FMT]
 			except KeyError:
@@ -111,13 +129,54 @@ class WavBase:
 			
 	def get_struct_fmt_str(self):
 		"""
-		Called in unpack and pack to determine struct formatting string based
+		Called in repack to determine struct formatting string based
 		on buffer length.
 		
-		Returns the struct formatting string used during unpack()/repack().
+		Returns the struct formatting string used during repack().
 		"""
 		return '<' + str(self.signalParams[KEY_STRUCT_MULTIPLIER]) + \
 			self.signalParams[KEY_STRUCT_FMT_CHAR]
+	
+	def widen_int24(self, byteArray):
+		"""
+		Widens packed 24-bit little-endian samples to 32-bit, by copying
+		the three bytes of each sample into the high bytes of a 32-bit
+		little-endian int (with extended slices, so there is no per-sample
+		Python code).  The ints that result are the samples * 256.
+		
+		Accepts:
+		
+		1) byteArray  ==> Binary of packed 24-bit samples.
+		
+		Returns a bytearray of 32-bit samples.
+		"""
+		narrow = bytes(byteArray)
+		wide = bytearray((len(narrow) // baseIO.INT24_SIZE) * 
+						 baseIO.INT32_SIZE)
+		wide[1::4] = narrow[0::3]
+		wide[2::4] = narrow[1::3]
+		wide[3::4] = narrow[2::3]
+		return wide
+	
+	def narrow_int24(self, wideByteArray, narrow):
+		"""
+		Narrows 32-bit little-endian samples that are within the 24-bit
+		range to packed 24-bit samples, by dropping the high byte of each.
+		
+		Accepts:
+		
+		1) wideByteArray  ==> Binary of 32-bit samples.
+		
+		2) narrow         ==> The bytearray to write the packed 24-bit
+							  samples into, 3/4 the length of
+							  wideByteArray.
+		
+		Returns narrow.
+		"""
+		narrow[0::3] = wideByteArray[0::4]
+		narrow[1::3] = wideByteArray[1::4]
+		narrow[2::3] = wideByteArray[2::4]
+		return narrow
 
 
 
@@ -141,17 +200,17 @@ class WavIn(baseIO.BaseFileIn, WavBase):
 		1) readStream  ==> The open read file.
 		"""
 		# BIN SEARCH FOR CHUNK IDs
-		self.read_and_assign(readStream, WAV_HEADER_SEARCH_LEN, (
-			(baseIO.DIRECT, KEY_RIFF_ID_INDEX, 
-			lambda: self.byteArray.find(RIFF_ID_HEX)),
-			(baseIO.DIRECT, KEY_WAVE_ID_INDEX, 
-			lambda: self.byteArray.find(WAVE_ID_HEX)),
-			(baseIO.DIRECT, KEY_FMT_ID_INDEX, 
-			lambda: self.byteArray.find(FMT_ID_HEX)),
-			(baseIO.DIRECT, KEY_FACT_ID_INDEX, 
-			lambda: self.byteArray.find(FACT_ID_HEX)),
-			(baseIO.DIRECT, KEY_DATA_ID_INDEX, 
-			lambda: self.byteArray.find(DATA_ID_HEX))))
+		self.byteArray = readStream.read(WAV_HEADER_SEARCH_LEN)
+		if not self.byteArray:
+			raise baseIO.ReadFileEmpty
+		else:
+			pass
+		find = self.byteArray.find
+		self.signalParams[KEY_RIFF_ID_INDEX] = find(RIFF_ID_HEX)
+		self.signalParams[KEY_WAVE_ID_INDEX] = find(WAVE_ID_HEX)
+		self.signalParams[KEY_FMT_ID_INDEX] = find(FMT_ID_HEX)
+		self.signalParams[KEY_FACT_ID_INDEX] = find(FACT_ID_HEX)
+		self.signalParams[KEY_DATA_ID_INDEX] = find(DATA_ID_HEX)
 		# Verify file format
 		if (self.signalParams[KEY_RIFF_ID_INDEX] or 
 			self.signalParams[KEY_WAVE_ID_INDEX] or
@@ -161,36 +220,53 @@ class WavIn(baseIO.BaseFileIn, WavBase):
 			raise baseIO.IncompatibleFileFormat('file is not RIFF WAVE type')
 		else:
 			pass
-		# RESET CURRENT POSITION
-		readStream.seek(0)
 		self.readOffset = 0
-		self.headerLen = 0
 		
 		# BEGIN INIT:
-		# READ AND STORE CHUNK HEADER + fmt SUBCHUNK HEADER AND BODY
+		# THE WHOLE HEADER, UP TO THE START OF THE SIGNAL DATA, IS THE
+		# SEARCH WINDOW ALREADY READ, PLUS AT MOST THE REST OF THE data
+		# SUBCHUNK HEADER; LEAVE THE STREAM AT THE START OF THE DATA
+		headerLen = self.signalParams[KEY_DATA_ID_INDEX] + \
+			WAV_SUBCHUNK_HEAD_SIZE
+		searchLen = len(self.byteArray)
+		if headerLen > searchLen:
+			self.byteArray += readStream.read(headerLen - searchLen)
+		else:
+			self.byteArray = self.byteArray[:headerLen]
+			readStream.seek(headerLen)
+		self.headerLen = headerLen
+		# STORE CHUNK HEADER + fmt SUBCHUNK HEADER AND BODY
 		if self.signalParams[KEY_FACT_ID_INDEX] == BIN_SEARCH_FAIL:
-			readLen1 = self.signalParams[KEY_DATA_ID_INDEX]
+			fmtEnd = self.signalParams[KEY_DATA_ID_INDEX]
 		else:
-			readLen1 = self.signalParams[KEY_FACT_ID_INDEX]
-		self.read_and_assign(readStream, readLen1, (
-			(baseIO.BIG_UTF, KEY_CHUNK_ID, baseIO.INT32_SIZE),
-			(baseIO.LITTLE_UINT, KEY_CHUNK_SIZE, baseIO.INT32_SIZE),
-			(baseIO.BIG_UTF, KEY_FMT_ID, baseIO.INT32_SIZE),
-			(baseIO.BIG_UTF, KEY_SUBCHUNK1_ID, baseIO.INT32_SIZE),
-			(baseIO.LITTLE_UINT, KEY_SUBCHUNK1_SIZE, baseIO.INT32_SIZE),
-			(baseIO.LITTLE_UINT, KEY_AUDIO_FMT, baseIO.INT16_SIZE),
-			(baseIO.LITTLE_UINT, baseIO.CORE_KEY_NUM_CHANNELS, baseIO.INT16_SIZE),
-			(baseIO.LITTLE_UINT, baseIO.CORE_KEY_SAMPLE_RATE, baseIO.INT32_SIZE),
-			(baseIO.LITTLE_UINT, KEY_BYTE_RATE, baseIO.INT32_SIZE),
-			(baseIO.LITTLE_UINT, KEY_BLOCK_ALIGN, baseIO.INT16_SIZE),
-			(baseIO.LITTLE_UINT, baseIO.CORE_KEY_BIT_DEPTH, baseIO.INT16_SIZE),
-			(baseIO.LITTLE_UINT, KEY_CB_SIZE, baseIO.INT16_SIZE),
-			(baseIO.LITTLE_UINT, KEY_W_VALID_BPS, baseIO.INT16_SIZE),
-			(baseIO.LITTLE_UINT, KEY_DW_CHANNEL_MASK, baseIO.INT32_SIZE),
-			(baseIO.LITTLE_UINT, KEY_SUBFMT_AUDIO_FMT, baseIO.INT16_SIZE),
-			(baseIO.LITTLE_UINT, KEY_SUBFMT, SUBFMT_SIZE),
-			(baseIO.DIRECT, baseIO.CORE_KEY_BYTE_DEPTH, 
-			lambda: int(self.signalParams[baseIO.CORE_KEY_BIT_DEPTH] / baseIO.BYTE_SIZE))))
+			fmtEnd = self.signalParams[KEY_FACT_ID_INDEX]
+		# Fields of a shorter fmt subchunk than the extensible one are zero
+		fmtBinary = self.byteArray[:fmtEnd].ljust(
+			RIFF_FMT_STRUCT.size + FMT_EXT_STRUCT.size, b'\x00')
+		(chunkId, 
+		 self.signalParams[KEY_CHUNK_SIZE], 
+		 fmtId, 
+		 subchunk1Id, 
+		 self.signalParams[KEY_SUBCHUNK1_SIZE], 
+		 self.signalParams[KEY_AUDIO_FMT], 
+		 self.signalParams[baseIO.CORE_KEY_NUM_CHANNELS], 
+		 self.signalParams[baseIO.CORE_KEY_SAMPLE_RATE], 
+		 self.signalParams[KEY_BYTE_RATE], 
+		 self.signalParams[KEY_BLOCK_ALIGN], 
+		 self.signalParams[baseIO.CORE_KEY_BIT_DEPTH]) = \
+			RIFF_FMT_STRUCT.unpack_from(fmtBinary)
+		(self.signalParams[KEY_CB_SIZE], 
+		 self.signalParams[KEY_W_VALID_BPS], 
+		 self.signalParams[KEY_DW_CHANNEL_MASK], 
+		 self.signalParams[KEY_SUBFMT_AUDIO_FMT], 
+		 subFmt) = FMT_EXT_STRUCT.unpack_from(fmtBinary, RIFF_FMT_STRUCT.size)
+		self.signalParams[KEY_CHUNK_ID] = chunkId.decode('utf-8')
+		self.signalParams[KEY_FMT_ID] = fmtId.decode('utf-8')
+		self.signalParams[KEY_SUBCHUNK1_ID] = subchunk1Id.decode('utf-8')
+		self.signalParams[KEY_SUBFMT] = int.from_bytes(subFmt, 
+													   byteorder='little')
+		self.signalParams[baseIO.CORE_KEY_BYTE_DEPTH] = \
+			self.signalParams[baseIO.CORE_KEY_BIT_DEPTH] // baseIO.BYTE_SIZE
 		# set core key baseIO.CORE_KEY_FMT
 		if self.signalParams[KEY_AUDIO_FMT] == WAV_FMT_PCM:
 			self.signalParams[baseIO.CORE_KEY_FMT] = baseIO.PCM
@@ -198,43 +274,33 @@ class WavIn(baseIO.BaseFileIn, WavBase):
 			self.signalParams[baseIO.CORE_KEY_FMT] = baseIO.FLOAT
 		else:
 			pass
-		# set core key baseIO.CORE_KEY_SIGNED
-		if self.signalParams[KEY_AUDIO_FMT] == WAV_FMT_PCM and \
-			self.signalParams[baseIO.CORE_KEY_BYTE_DEPTH] == baseIO.INT8_SIZE:
-			self.signalParams[baseIO.CORE_KEY_SIGNED] = False
-		else:
-			self.signalParams[baseIO.CORE_KEY_SIGNED] = True
-		# IF NO FACT SUBCHUNK PRESENT
-		if self.signalParams[KEY_FACT_ID_INDEX] == BIN_SEARCH_FAIL:
-			readLen2 = WAV_SUBCHUNK_HEAD_SIZE
-			self.read_and_assign(readStream, readLen2, (
-				(baseIO.BIG_UTF, KEY_SUBCHUNK2_ID, baseIO.INT32_SIZE),
-				(baseIO.LITTLE_UINT, KEY_SUBCHUNK2_SIZE, 
-				baseIO.INT32_SIZE),))
+		# STORE THE fact (IF PRESENT) AND data SUBCHUNK HEADERS
+		subchunk2Id, self.signalParams[KEY_SUBCHUNK2_SIZE] = \
+			SUBCHUNK_HEAD_STRUCT.unpack_from(self.byteArray, fmtEnd)
+		self.signalParams[KEY_SUBCHUNK2_ID] = subchunk2Id.decode('utf-8')
 		# IF FACT SUBCHUNK PRESENT
+		if self.signalParams[KEY_FACT_ID_INDEX] != BIN_SEARCH_FAIL:
+			sampleLenStart = fmtEnd + WAV_SUBCHUNK_HEAD_SIZE
+			sampleLenEnd = sampleLenStart + \
+				self.signalParams[KEY_SUBCHUNK2_SIZE]
+			self.signalParams[KEY_DW_SAMPLE_LEN] = int.from_bytes(
+				self.byteArray[sampleLenStart:sampleLenEnd], 
+				byteorder='little')
+			subchunk3Id, self.signalParams[KEY_SUBCHUNK3_SIZE] = \
+				SUBCHUNK_HEAD_STRUCT.unpack_from(self.byteArray, sampleLenEnd)
+			self.signalParams[KEY_SUBCHUNK3_ID] = subchunk3Id.decode('utf-8')
 		else:
-			readLen2 = ((self.signalParams[KEY_DATA_ID_INDEX] - 
-				self.signalParams[KEY_FACT_ID_INDEX]) + 
-				WAV_SUBCHUNK_HEAD_SIZE)
-			self.read_and_assign(readStream, readLen2, (
-				(baseIO.BIG_UTF, KEY_SUBCHUNK2_ID, baseIO.INT32_SIZE),
-				(baseIO.LITTLE_UINT, KEY_SUBCHUNK2_SIZE, 
-				baseIO.INT32_SIZE),
-				(baseIO.LITTLE_UINT, KEY_DW_SAMPLE_LEN, 
-				lambda: self.signalParams[KEY_SUBCHUNK2_SIZE]),
-				(baseIO.BIG_UTF, KEY_SUBCHUNK3_ID, baseIO.INT32_SIZE),
-				(baseIO.LITTLE_UINT, KEY_SUBCHUNK3_SIZE, 
-				baseIO.INT32_SIZE)))
+			pass
 		# ASSIGN CORE KEY samples per channel
 		try:
 			sampPerChan = self.signalParams[KEY_DW_SAMPLE_LEN]
 		except KeyError:
 			if self.signalParams[KEY_SUBCHUNK2_ID] == DATA_SUBCHUNK_ID:
-				sampPerChan = int(self.signalParams[KEY_SUBCHUNK2_SIZE] / 
-					self.signalParams[KEY_BLOCK_ALIGN])
+				sampPerChan = self.signalParams[KEY_SUBCHUNK2_SIZE] // \
+					self.signalParams[KEY_BLOCK_ALIGN]
 			elif self.signalParams[KEY_SUBCHUNK3_ID] == DATA_SUBCHUNK_ID:
-				sampPerChan = int(self.signalParams[KEY_SUBCHUNK3_SIZE] / 
-					self.signalParams[KEY_BLOCK_ALIGN])
+				sampPerChan = self.signalParams[KEY_SUBCHUNK3_SIZE] // \
+					self.signalParams[KEY_BLOCK_ALIGN]
 			else:
 				raise
 		self.signalParams[baseIO.CORE_KEY_SAMPLES_PER_CHANNEL] = sampPerChan
@@ -254,21 +320,28 @@ class WavIn(baseIO.BaseFileIn, WavBase):
 		Returns a nested list of numeric-type data that can be manipulated
 		algorithmicly by the plugin.
 		"""
-		# Setup
-		nestedSampleList = []
-		self.signalParams[KEY_STRUCT_MULTIPLIER] = \
-			int(len(byteArray) / self.signalParams[baseIO.CORE_KEY_BYTE_DEPTH])
-		# Unpack buffer
-		bufferUnpacked = struct.unpack(self.get_struct_fmt_str(), byteArray[:])
-		# Assemble into nested list
-		for block in range(int(len(bufferUnpacked)  / 
-								self.signalParams[baseIO.CORE_KEY_NUM_CHANNELS])):
-			sampleList = []
-			for i in range(self.signalParams[baseIO.CORE_KEY_NUM_CHANNELS]):
-				sampleList.append(bufferUnpacked[(block * \
-					self.signalParams[baseIO.CORE_KEY_NUM_CHANNELS])+i])
-			nestedSampleList.append(sampleList)
-		return nestedSampleList
+		int24 = self.signalParams[baseIO.CORE_KEY_BYTE_DEPTH] == \
+			baseIO.INT24_SIZE
+		if int24:
+			byteArray = self.widen_int24(byteArray)
+		else:
+			pass
+		# Unpack buffer in one pass; WAV binary is always little-endian
+		bufferUnpacked = array.array(self.signalParams[KEY_STRUCT_FMT_CHAR])
+		bufferUnpacked.frombytes(byteArray)
+		if sys.byteorder == 'big':
+			bufferUnpacked.byteswap()
+		# Widened 24-bit samples are * 256; shift back down (sign-extends)
+		if int24:
+			samples = map(rshift, bufferUnpacked, repeat(baseIO.BYTE_SIZE))
+		else:
+			samples = iter(bufferUnpacked)
+		# Assemble into nested list, numChannels samples per block
+		numChannels = self.signalParams[baseIO.CORE_KEY_NUM_CHANNELS]
+		if numChannels == 1:
+			return [[sample] for sample in samples]
+		else:
+			return list(map(list, zip(*[samples] * numChannels)))
 	
 	# ------------------------------------------------------------------------
 	# ------------------------------ END: OVERRIDES --------------------------
@@ -314,50 +387,36 @@ class WavOut(baseIO.BaseFileOut, WavBase):
 		self.signalParams[KEY_BYTE_RATE] = \
 			self.signalParams[KEY_BLOCK_ALIGN] * \
 			self.signalParams[baseIO.CORE_KEY_SAMPLE_RATE]
-		# set core key baseIO.CORE_KEY_SIGNED
-		if self.signalParams[KEY_AUDIO_FMT] == WAV_FMT_PCM and \
-				self.signalParams[baseIO.CORE_KEY_BYTE_DEPTH] == \
-				baseIO.INT8_SIZE:
-			self.signalParams[baseIO.CORE_KEY_SIGNED] = False
-		else:
-			self.signalParams[baseIO.CORE_KEY_SIGNED] = True
-		# init the struct fmt string
+		# init the struct fmt string, and core key baseIO.CORE_KEY_SIGNED
 		self.init_struct_fmt_str()
 		
 		# Populate the remaining fields:
 		# CALCULATE INTERMEDIATE VALUES
+		# (integer ceiling division by 2**32)
 		factChunkSizeMultiplier = \
-			math.ceil(self.signalParams[baseIO.CORE_KEY_SAMPLES_PER_CHANNEL] / 
-					  (2**32))
+			(self.signalParams[baseIO.CORE_KEY_SAMPLES_PER_CHANNEL] + 
+			 UINT32_RANGE - 1) >> 32
 		dataChunkSize = \
-			int((self.signalParams[baseIO.CORE_KEY_SAMPLES_PER_CHANNEL] + \
-			reachBack) * \
-			self.signalParams[baseIO.CORE_KEY_BYTE_DEPTH] * \
-			self.signalParams[baseIO.CORE_KEY_NUM_CHANNELS])
+			(self.signalParams[baseIO.CORE_KEY_SAMPLES_PER_CHANNEL] + 
+			 reachBack) * self.signalParams[KEY_BLOCK_ALIGN]
 		# SET ID STRINGS
 		self.signalParams[KEY_CHUNK_ID] = RIFF_CHUNK_ID
 		self.signalParams[KEY_FMT_ID] = WAVE_ID
 		self.signalParams[KEY_SUBCHUNK1_ID] = FMT_SUBCHUNK_ID
-		# IF AUDIO FORMAT = PCM, BIT-DEPTH <= 16
+		# IF AUDIO FORMAT = PCM, BIT-DEPTH <= 24
 		if (self.signalParams[KEY_AUDIO_FMT] == 
 			WAV_FMT_PCM) and (self.signalParams[baseIO.CORE_KEY_BYTE_DEPTH] <= 
-								baseIO.INT16_SIZE):
+								baseIO.INT24_SIZE):
 			self.signalParams[KEY_SUBCHUNK1_SIZE] = FMT_CHUNK_SIZE_16
 			self.signalParams[KEY_SUBCHUNK2_ID] = DATA_SUBCHUNK_ID
 			self.signalParams[KEY_SUBCHUNK2_SIZE] = dataChunkSize
-		# IF AUDIO FORMAT = PCM, BIT-DEPTH = 24
-		# IN PROGRESS !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
-		elif (self.signalParams[KEY_AUDIO_FMT] == 
-			  WAV_FMT_PCM) and (self.signalParams[baseIO.CORE_KEY_BYTE_DEPTH] == 
-			  					baseIO.INT24_SIZE):
-			pass
 		# IF AUDIO FORMAT = FLOAT
 		elif self.signalParams[KEY_AUDIO_FMT] == WAV_FMT_FLOAT:
 			self.signalParams[KEY_SUBCHUNK1_SIZE] = FMT_CHUNK_SIZE_18
 			self.signalParams[KEY_CB_SIZE] = FMT_EXT_SIZE_0
 			self.signalParams[KEY_SUBCHUNK2_ID] = FACT_SUBCHUNK_ID
 			self.signalParams[KEY_SUBCHUNK2_SIZE] = \
-				int(baseIO.INT32_SIZE * factChunkSizeMultiplier)
+				baseIO.INT32_SIZE * factChunkSizeMultiplier
 			self.signalParams[KEY_DW_SAMPLE_LEN] = \
 				self.signalParams[baseIO.CORE_KEY_SAMPLES_PER_CHANNEL] + \
 				reachBack
@@ -366,17 +425,17 @@ class WavOut(baseIO.BaseFileOut, WavBase):
 		# CALCULATE CHUNK SIZE:
 		if self.signalParams[KEY_SUBCHUNK2_ID] == DATA_SUBCHUNK_ID:
 			self.signalParams[KEY_CHUNK_SIZE] = \
-				int((2 * WAV_SUBCHUNK_HEAD_SIZE) + \
-					WAV_CHUNK_SIZE_ADDITION + \
-					self.signalParams[KEY_SUBCHUNK1_SIZE] + \
-					self.signalParams[KEY_SUBCHUNK2_SIZE])
+				(2 * WAV_SUBCHUNK_HEAD_SIZE) + \
+				WAV_CHUNK_SIZE_ADDITION + \
+				self.signalParams[KEY_SUBCHUNK1_SIZE] + \
+				self.signalParams[KEY_SUBCHUNK2_SIZE]
 		else:
 			self.signalParams[KEY_CHUNK_SIZE] = \
-				int((3 * WAV_SUBCHUNK_HEAD_SIZE) + \
-					WAV_CHUNK_SIZE_ADDITION + \
-					self.signalParams[KEY_SUBCHUNK1_SIZE] + \
-					self.signalParams[KEY_SUBCHUNK2_SIZE] + \
-					self.signalParams[KEY_SUBCHUNK3_SIZE])
+				(3 * WAV_SUBCHUNK_HEAD_SIZE) + \
+				WAV_CHUNK_SIZE_ADDITION + \
+				self.signalParams[KEY_SUBCHUNK1_SIZE] + \
+				self.signalParams[KEY_SUBCHUNK2_SIZE] + \
+				self.signalParams[KEY_SUBCHUNK3_SIZE]
 		return
 	
 	def write_header(self, writeStream):
@@ -390,45 +449,47 @@ class WavOut(baseIO.BaseFileOut, WavBase):
 		
 		1) writeStream  ==> A pointer to the open output file.
 		"""
-		# Write chunk header and fmt subchunk
-		self.pack_and_write(writeStream, (
-			(baseIO.BIG_UTF, KEY_CHUNK_ID),
-			(baseIO.LITTLE_UINT, KEY_CHUNK_SIZE, baseIO.INT32_SIZE),
-			(baseIO.BIG_UTF, KEY_FMT_ID),
-			(baseIO.BIG_UTF, KEY_SUBCHUNK1_ID),
-			(baseIO.LITTLE_UINT, KEY_SUBCHUNK1_SIZE, baseIO.INT32_SIZE),
-			(baseIO.LITTLE_UINT, KEY_AUDIO_FMT, baseIO.INT16_SIZE),
-			(baseIO.LITTLE_UINT, baseIO.CORE_KEY_NUM_CHANNELS, baseIO.INT16_SIZE),
-			(baseIO.LITTLE_UINT, baseIO.CORE_KEY_SAMPLE_RATE, baseIO.INT32_SIZE),
-			(baseIO.LITTLE_UINT, KEY_BYTE_RATE, baseIO.INT32_SIZE),
-			(baseIO.LITTLE_UINT, KEY_BLOCK_ALIGN, baseIO.INT16_SIZE),
-			(baseIO.LITTLE_UINT, baseIO.CORE_KEY_BIT_DEPTH, baseIO.INT16_SIZE)))
+		params = self.signalParams
+		# Pack chunk header and fmt subchunk
+		header = bytearray(RIFF_FMT_STRUCT.pack(
+			params[KEY_CHUNK_ID].encode('utf-8'), 
+			params[KEY_CHUNK_SIZE], 
+			params[KEY_FMT_ID].encode('utf-8'), 
+			params[KEY_SUBCHUNK1_ID].encode('utf-8'), 
+			params[KEY_SUBCHUNK1_SIZE], 
+			params[KEY_AUDIO_FMT], 
+			params[baseIO.CORE_KEY_NUM_CHANNELS], 
+			params[baseIO.CORE_KEY_SAMPLE_RATE], 
+			params[KEY_BYTE_RATE], 
+			params[KEY_BLOCK_ALIGN], 
+			params[baseIO.CORE_KEY_BIT_DEPTH]))
 		# Handle format subchunk extension
-		if self.signalParams[KEY_SUBCHUNK1_SIZE] == FMT_CHUNK_SIZE_18:
-			self.pack_and_write(writeStream, (
-				(baseIO.LITTLE_UINT, KEY_CB_SIZE, baseIO.INT16_SIZE),))
-		elif self.signalParams[KEY_SUBCHUNK1_SIZE] == FMT_CHUNK_SIZE_40:
-			self.pack_and_write(writeStream, (
-				(baseIO.LITTLE_UINT, KEY_CB_SIZE, baseIO.INT16_SIZE),
-				(baseIO.LITTLE_UINT, KEY_W_VALID_BPS, baseIO.INT16_SIZE),
-				(baseIO.LITTLE_UINT, KEY_DW_CHANNEL_MASK, baseIO.INT32_SIZE),
-				(baseIO.LITTLE_UINT, KEY_SUBFMT_AUDIO_FMT, baseIO.INT16_SIZE),
-				(baseIO.DIRECT, KEY_SUBFMT)))
+		if params[KEY_SUBCHUNK1_SIZE] == FMT_CHUNK_SIZE_18:
+			header += CB_SIZE_STRUCT.pack(params[KEY_CB_SIZE])
+		elif params[KEY_SUBCHUNK1_SIZE] == FMT_CHUNK_SIZE_40:
+			header += FMT_EXT_STRUCT.pack(
+				params[KEY_CB_SIZE], 
+				params[KEY_W_VALID_BPS], 
+				params[KEY_DW_CHANNEL_MASK], 
+				params[KEY_SUBFMT_AUDIO_FMT], 
+				params[KEY_SUBFMT].to_bytes(SUBFMT_SIZE, byteorder='little'))
 		else:
 			pass
-		self.pack_and_write(writeStream, (
-			(baseIO.BIG_UTF, KEY_SUBCHUNK2_ID),
-			(baseIO.LITTLE_UINT, KEY_SUBCHUNK2_SIZE, baseIO.INT32_SIZE)))
-		# Conditionally handle fact subchunk, write data subchunk
+		header += SUBCHUNK_HEAD_STRUCT.pack(
+			params[KEY_SUBCHUNK2_ID].encode('utf-8'), 
+			params[KEY_SUBCHUNK2_SIZE])
+		# Conditionally handle fact subchunk, pack data subchunk header
 		# If fact subchunk is present
-		if self.signalParams[KEY_SUBCHUNK2_ID] != DATA_SUBCHUNK_ID:
-			self.pack_and_write(writeStream, (
-				(baseIO.LITTLE_UINT, KEY_DW_SAMPLE_LEN, 
-				lambda: self.signalParams[KEY_SUBCHUNK2_SIZE]),
-				(baseIO.BIG_UTF, KEY_SUBCHUNK3_ID),
-				(baseIO.LITTLE_UINT, KEY_SUBCHUNK3_SIZE, baseIO.INT32_SIZE)))
+		if params[KEY_SUBCHUNK2_ID] != DATA_SUBCHUNK_ID:
+			header += params[KEY_DW_SAMPLE_LEN].to_bytes(
+				params[KEY_SUBCHUNK2_SIZE], byteorder='little')
+			header += SUBCHUNK_HEAD_STRUCT.pack(
+				params[KEY_SUBCHUNK3_ID].encode('utf-8'), 
+				params[KEY_SUBCHUNK3_SIZE])
 		else:
 			pass
+		# Write the whole header at once
+		writeStream.write(header)
 	
 	def repack(self, processedSampleNestedList):
 		"""
@@ -442,20 +503,39 @@ class WavOut(baseIO.BaseFileOut, WavBase):
 		1) processedSampleNestedList  ==> A nested list of processed sample
 										  data.
 		
-		Returns a bytearray of the processed signal data.
+		Returns a memoryview of the processed signal data, valid until the
+		next call (see baseIO.BaseFileOut.repack).
 		"""
-		# Setup
-		intTupleList = []
-		processedByteArray = bytearray()
-		# Disassemble nested list into tuple
-		for block in range(len(processedSampleNestedList)):
-			for channel in range(self.signalParams[baseIO.CORE_KEY_NUM_CHANNELS]):
-				intTupleList.append(processedSampleNestedList[block][channel])
-		intTuple = tuple(intTupleList)
-		self.signalParams[KEY_STRUCT_MULTIPLIER] = len(intTuple)
-		# Pack
-		processedByteArray = struct.pack(self.get_struct_fmt_str(), *intTuple)
-		return processedByteArray
+		numSamples = len(processedSampleNestedList) * \
+			self.signalParams[baseIO.CORE_KEY_NUM_CHANNELS]
+		# Compile a struct and allocate its output buffer once per buffer
+		# length; lengths differ only for the last buffer-full of the
+		# signal and of the flush
+		try:
+			repackStruct, repackByteArray, outByteArray, repackView = \
+				self.repackStructs[numSamples]
+		except KeyError:
+			self.signalParams[KEY_STRUCT_MULTIPLIER] = numSamples
+			repackStruct = struct.Struct(self.get_struct_fmt_str())
+			repackByteArray = bytearray(repackStruct.size)
+			# 24-bit samples are packed as 32-bit ints, then narrowed into
+			# a second buffer
+			if self.signalParams[baseIO.CORE_KEY_BYTE_DEPTH] == \
+					baseIO.INT24_SIZE:
+				outByteArray = bytearray(numSamples * baseIO.INT24_SIZE)
+			else:
+				outByteArray = repackByteArray
+			repackView = memoryview(outByteArray)
+			self.repackStructs[numSamples] = (repackStruct, repackByteArray, 
+											  outByteArray, repackView)
+		# Pack the flattened nested list directly into the pack buffer
+		repackStruct.pack_into(repackByteArray, 0, 
+			*chain.from_iterable(processedSampleNestedList))
+		if outByteArray is not repackByteArray:
+			self.narrow_int24(repackByteArray, outByteArray)
+		else:
+			pass
+		return repackView
 	
 	# ------------------------------------------------------------------------
 	# ------------------------------ END: OVERRIDES --------------------------
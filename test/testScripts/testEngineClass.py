@@ -50,6 +50,69 @@ class EngineInitTestMethods(unittest.TestCase):
 											TEST_WRITE_FILE, 
 											algorithm=self.plugin_cb)
 		self.assertIsInstance(engineObj, engine.FileToFileEngine)
+	
+	def test_buffer_multiplier(self):
+		"""
+		Test that the BUFFER_MULTIPLIER option scales the buffer-full
+		size without changing the processed output.
+		"""
+		engineObj = engine.FileToFileEngine(self.testReadFile, 
+											TEST_WRITE_FILE, 
+											algorithm=self.plugin_cb)
+		engineObj.process()
+		with open(TEST_WRITE_FILE, 'rb') as writeStream:
+			expected = writeStream.read()
+		options = {engine.BUFFER_MULTIPLIER: 4}
+		multipliedObj = engine.FileToFileEngine(self.testReadFile, 
+												TEST_WRITE_FILE, 
+												algorithm=self.plugin_cb,
+												options=options)
+		self.assertEqual(multipliedObj.samplesPerBuffer, 
+						 4 * engineObj.samplesPerBuffer)
+		multipliedObj.process()
+		with open(TEST_WRITE_FILE, 'rb') as writeStream:
+			self.assertEqual(writeStream.read(), expected)
+
+	def test_invalid_buffer_multiplier(self):
+		"""
+		Test that a BUFFER_MULTIPLIER that is not an int >= 1 raises
+		InvalidInput.
+		"""
+		for bufferMultiplier in (0, -2, 1.5):
+			with self.subTest(bufferMultiplier=bufferMultiplier):
+				options = {engine.BUFFER_MULTIPLIER: bufferMultiplier,
+						   engine.PLUGIN_REACH_BACK: 5}
+				with self.assertRaises(engine.InvalidInput):
+					engine.FileToFileEngine(self.testReadFile,
+											TEST_WRITE_FILE,
+											algorithm=self.plugin_cb,
+											options=options)
+
+	def test_default_algorithm_wrapper(self):
+		"""
+		Test that PCM to PCM processing with the default algorithm uses
+		the unclipped wrapper, and writes the same output as the clipped
+		wrapper.
+		"""
+		readFile = os.path.join(TEST_DATA_DIR,
+								'ENGINE_PCM_2CH_44100SR_16BIT.wav')
+		for options in ({}, {engine.OUTPUT_BIT_DEPTH: 8}):
+			with self.subTest(options=options):
+				engineObj = engine.FileToFileEngine(readFile,
+													TEST_WRITE_FILE,
+													algorithm=self.plugin_cb,
+													options=options)
+				engineObj.process()
+				with open(TEST_WRITE_FILE, 'rb') as writeStream:
+					expected = writeStream.read()
+				defaultObj = engine.FileToFileEngine(readFile,
+													 TEST_WRITE_FILE,
+													 options=options)
+				self.assertIs(defaultObj.algorithm_wrapper.__func__,
+							  enginehelper.wrapper_ppp_default)
+				defaultObj.process()
+				with open(TEST_WRITE_FILE, 'rb') as writeStream:
+					self.assertEqual(writeStream.read(), expected)
 
 
 class EngineConversionTestMethods(unittest.TestCase):
@@ -301,6 +364,50 @@ class EngineConversionTestMethods(unittest.TestCase):
 				engineObjB = engine.FileToFileEngine(writeFile, postTestFile, 
 										algorithm=paramList[6])
 				engineObjB.process()
+	
+	def scale_pcm_cb(self, engineObj, sampleNestedList):
+		"""
+		A PCM plugin that returns (unclipped) float samples.
+		"""
+		return [[sample * 0.5 for sample in block] 
+				for block in sampleNestedList]
+	
+	def assert_int_only_cb(self, engineObj, sampleNestedList):
+		"""
+		Assert that every sample is integer format.
+		"""
+		for block in sampleNestedList:
+			for sample in block:
+				self.assertIsInstance(sample, int)
+		return sampleNestedList
+	
+	def test_float_returning_pcm_plugin(self):
+		"""
+		Test that float samples returned by a PCM plugin are written as
+		integers when the write file is unsigned 8 bit PCM.
+		"""
+		# paramList[0]  ==>  The test read file
+		# paramList[1]  ==>  The test write file
+		paramNest = [
+			['ENGINE_PCM_2CH_44100SR_8BIT.wav', 'ENGINE_PCM8_to_PCM8.wav'],
+			['ENGINE_FLOAT_2CH_44100SR_32BIT.wav', 'ENGINE_FLOAT32_to_PCM8.wav']
+		]
+		for paramList in paramNest:
+			with self.subTest(params = paramList):
+				readFile = os.path.join(TEST_DATA_DIR, paramList[0])
+				writeFile = os.path.join(TEST_DATA_DIR, paramList[1])
+				options = {
+					engine.OUTPUT_FMT: 'PCM',
+					engine.OUTPUT_BIT_DEPTH: 8,
+					engine.PLUGIN_FMT: 'PCM'
+				}
+				engineObjA = engine.FileToFileEngine(readFile, writeFile, 
+										algorithm=self.scale_pcm_cb, 
+										options=options)
+				engineObjA.process()
+				engineObjB = engine.FileToFileEngine(writeFile, TEST_WRITE_FILE, 
+										algorithm=self.assert_int_only_cb)
+				engineObjB.process()
 		
 		
 		
@@ -410,7 +517,90 @@ class FloatPcmConversionsTestMethods(unittest.TestCase):
 					self.assertTrue(tolerance > 
 									abs(converted[i][0] - paramList[3][i][0]))
 	
+	def test_pcm_to_pcm_sign_change(self):
+		"""
+		Test that the PCM to PCM conversion is exact when only the
+		signedness changes.
+		"""
+		paramNest = [
+			[
+				[[0, 255], [127, 128]], 
+				8, 
+				False, 
+				True, 
+				[[-128, 127], [-1, 0]]
+			],
+			[
+				[[-32768, 32767], [-1, 0]], 
+				16, 
+				True, 
+				False, 
+				[[0, 65535], [32767, 32768]]
+			]
+		]
+		for paramList in paramNest:
+			with self.subTest(params=paramList):
+				converted = enginehelper.pcm_to_pcm(paramList[0], 
+													 paramList[1], 
+													 paramList[1], 
+													 paramList[2], 
+													 paramList[3])
+				self.assertEqual(converted, paramList[4])
+
+	def test_pcm_to_pcm_depth_change(self):
+		"""
+		Test that the PCM to PCM conversion shifts the samples when only
+		the bit depth changes.
+		"""
+		paramNest = [
+			[
+				[[-32768, 32767], [-1, 1]],
+				16,
+				24,
+				[[-8388608, 8388352], [-256, 256]]
+			],
+			[
+				[[-8388608, 8388607], [-1, 256]],
+				24,
+				16,
+				[[-32768, 32767], [-1, 1]]
+			],
+			[
+				[[664, 664.7], [-1.5, 63.9]],
+				16,
+				24,
+				[[169984, 169984], [-512, 16128]]
+			],
+			[
+				[[-127.5, 127.9], [1.5, -0.5]],
+				8,
+				16,
+				[[-32768, 32512], [256, -256]]
+			]
+		]
+		for paramList in paramNest:
+			with self.subTest(params=paramList):
+				converted = enginehelper.pcm_to_pcm(paramList[0],
+													 paramList[1],
+													 paramList[2],
+													 True,
+													 True)
+				self.assertEqual(converted, paramList[3])
 	
+	def test_pcm_to_pcm_shift_vs_float_scaling(self):
+		"""
+		Test the documented difference between the shift used when only
+		the bit depth changes, and the float round trip: widening by
+		shift zero-fills the low bits, the float path scales to the
+		full output range.
+		"""
+		shifted = enginehelper.pcm_to_pcm([[664]], 16, 24, True, True)
+		self.assertEqual(shifted, [[169984]])
+		viaFloat = enginehelper.float_to_pcm(
+			enginehelper.pcm_to_float([[664]], 16, True), 24, True)
+		self.assertEqual(viaFloat, [[170239]])
+
+
 class ClipTestMethods(unittest.TestCase):
 	"""
 	Methods to test the FileToFileEngine.clip_float() and FileToFileEngine.clip_pcm()
@@ -525,6 +715,69 @@ class ClipTestMethods(unittest.TestCase):
 													 paramList[0])
 				self.assertEqual(clippedNest, paramList[2])
 	
+	def test_fused_clip_conversions(self):
+		"""
+		Test that the single-pass clip-and-convert functions give the
+		same result as clipping, then converting.
+		"""
+		floatNest = [[-1.5, 1.5], [-1.0, 1.0], [-0.5, 0.25], [0.0, 0.0]]
+		for bitDepth, signed in ((8, False), (16, True), (32, True)):
+			with self.subTest(bitDepth=bitDepth, signed=signed):
+				expected = enginehelper.float_to_pcm(
+					enginehelper.clip_float([block[:] for block in floatNest]), 
+					bitDepth, signed)
+				converted = enginehelper.clip_float_to_pcm(
+					[block[:] for block in floatNest], bitDepth, signed)
+				self.assertEqual(converted, expected)
+		pcmNest = [[-40000, 40000], [-32768, 32767], [-1, 1], [0, 0]]
+		expected = enginehelper.pcm_to_float(
+			enginehelper.clip_pcm([block[:] for block in pcmNest], 16), 
+			16, True)
+		converted = enginehelper.clip_pcm_to_float(
+			[block[:] for block in pcmNest], 16)
+		self.assertEqual(converted, expected)
+	
+	
+class ReachBackRingTestMethods(unittest.TestCase):
+	"""
+	Methods to test the enginehelper.ReachBackRing class.
+	"""
+	def test_push_and_get(self):
+		"""
+		Test lookups across several pushes, including ones that wrap
+		around the end of the ring.
+		"""
+		ring = enginehelper.ReachBackRing(5, 2)
+		ring.push([[1, -1], [2, -2], [3, -3]])
+		self.assertEqual(ring.get(1, 0, 0), 0)
+		self.assertEqual(ring.get(2, 2, 1), -1)
+		ring.push([[4, -4], [5, -5], [6, -6]])
+		self.assertEqual(ring.get(0, 2, 0), 6)
+		self.assertEqual(ring.get(2, 0, 1), -2)
+		self.assertEqual(ring.get(3, 1, 0), 2)
+	
+	def test_zero_capacity(self):
+		"""
+		Test that a ring with no capacity still accepts pushes.
+		"""
+		ring = enginehelper.ReachBackRing(0, 2)
+		ring.push([[1, -1], [2, -2]])
+		self.assertEqual(ring.totalBlocks, 2)
+		self.assertEqual(ring.get(1, 0, 0), 0)
+		self.assertEqual(ring.get(0, 1, 0), 0)
+	
+	def test_beyond_capacity(self):
+		"""
+		Test that blocks older than the ring's capacity read as zero
+		rather than wrapping around to newer samples.
+		"""
+		ring = enginehelper.ReachBackRing(5, 2)
+		ring.push([[1, -1], [2, -2], [3, -3]])
+		ring.push([[4, -4], [5, -5], [6, -6]])
+		self.assertEqual(ring.get(2, 0, 0), 2)
+		self.assertEqual(ring.get(3, 0, 0), 0)
+		self.assertEqual(ring.get(50, 2, 1), 0)
+	
 	
 class ReachBackTestMethods(unittest.TestCase):
 	"""
@@ -655,6 +908,32 @@ class ReachBackTestMethods(unittest.TestCase):
 								 (readDataSubChunkSize + sizeDiff))
 				
 				
+	def test_flush_block_count(self):
+		"""
+		Test that FileToFileEngine.flush() feeds the algorithm exactly
+		reachBack blocks of zeros, and never an empty buffer-full.
+		"""
+		readFile = os.path.join(TEST_DATA_DIR, 
+								'ENGINE_PCM_2CH_44100SR_16BIT.wav')
+		writeFile = os.path.join(TEST_DATA_DIR, 'temp1.wav')
+		bufferLens = []
+		def cb(engineObj, sampleNestedList):
+			bufferLens.append(len(sampleNestedList))
+			return sampleNestedList
+		engineObj = engine.FileToFileEngine(readFile, writeFile, 
+											algorithm=cb)
+		reachBack = 2 * engineObj.samplesPerBuffer
+		engineObj = engine.FileToFileEngine(
+							readFile, 
+							writeFile, 
+							algorithm=cb, 
+							options={engine.PLUGIN_REACH_BACK: reachBack})
+		engineObj.process()
+		dataBlocks = engineObj.inputSignal.signalParams[
+						baseIO.CORE_KEY_SAMPLES_PER_CHANNEL]
+		self.assertNotIn(0, bufferLens)
+		self.assertEqual(sum(bufferLens), dataBlocks + reachBack)
+	
 	def test_reach_back(self):
 		"""
 		Test the reach_back() method.
@@ -855,4 +1134,25 @@ class ReachBackTestMethods(unittest.TestCase):
 		
 	
 	
-	
\ No newline at end of file
+		
+	def test_reach_back_beyond_option(self):
+		"""
+		Test that reaching back further than the PLUGIN_REACH_BACK option,
+		including when it is not set, raises InvalidInput.
+		"""
+		readFile = os.path.join(TEST_DATA_DIR, 
+								'ENGINE_PCM_2CH_44100SR_16BIT.wav')
+		for reachBack in (0, 5):
+			with self.subTest(reachBack=reachBack):
+				self.reachback_cb_closure(50)
+				options = {
+					engine.PLUGIN_REACH_BACK: reachBack
+				}
+				engineObj = engine.FileToFileEngine(
+									readFile, 
+									TEST_WRITE_FILE, 
+									algorithm=self.reachback_cb, 
+									options=options)
+				with self.assertRaises(engine.InvalidInput):
+					engineObj.process()
+				self.dataNest.clear()
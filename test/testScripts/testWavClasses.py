@@ -128,6 +128,93 @@ class WavInitHeaderTestMethods(unittest.TestCase):
 		})
 
 
+class WavInt24TestMethods(unittest.TestCase):
+	"""
+	Methods to test the unpacking and repacking of 24-bit PCM samples.
+	"""
+	def test_unpack_repack_int24(self):
+		"""
+		Test that 24-bit samples, including the extremes of the range,
+		unpack to the correct ints and repack to the original binary.
+		"""
+		samples = [-8388608, 8388607, -1, 0, 1, -65536]
+		binary = b''.join(sample.to_bytes(3, byteorder='little', signed=True)
+						  for sample in samples)
+		readAudioObj = wavIO.WavIn(TEST_READ_FILE)
+		readAudioObj.signalParams[baseIO.CORE_KEY_NUM_CHANNELS] = 2
+		readAudioObj.signalParams[baseIO.CORE_KEY_BYTE_DEPTH] = 3
+		readAudioObj.signalParams[wavIO.KEY_STRUCT_FMT_CHAR] = 'i'
+		sampleNestedList = readAudioObj.unpack(binary)
+		self.assertEqual(sampleNestedList, 
+						 [[-8388608, 8388607], [-1, 0], [1, -65536]])
+		writeAudioObj = wavIO.WavOut(TEST_WRITE_FILE, 'PCM', 2, 24, 44100)
+		readAudioObj.signalParams[baseIO.CORE_KEY_SAMPLES_PER_CHANNEL] = 3
+		writeAudioObj.init_header(readAudioObj, 0)
+		self.assertEqual(writeAudioObj.repack(sampleNestedList), binary)
+
+
+class WavMonoTestMethods(unittest.TestCase):
+	"""
+	Methods to test the unpacking and repacking of single-channel samples.
+	"""
+	def test_unpack_repack_mono(self):
+		"""
+		Test that mono samples unpack to one-sample blocks and repack to
+		the original binary.
+		"""
+		samples = [-32768, 32767, -1, 0, 1]
+		binary = b''.join(sample.to_bytes(2, byteorder='little', signed=True)
+						  for sample in samples)
+		readAudioObj = wavIO.WavIn(TEST_READ_FILE)
+		readAudioObj.signalParams[baseIO.CORE_KEY_NUM_CHANNELS] = 1
+		readAudioObj.signalParams[baseIO.CORE_KEY_BYTE_DEPTH] = 2
+		readAudioObj.signalParams[wavIO.KEY_STRUCT_FMT_CHAR] = 'h'
+		sampleNestedList = readAudioObj.unpack(binary)
+		self.assertEqual(sampleNestedList, [[sample] for sample in samples])
+		writeAudioObj = wavIO.WavOut(TEST_WRITE_FILE, 'PCM', 1, 16, 44100)
+		readAudioObj.signalParams[baseIO.CORE_KEY_SAMPLES_PER_CHANNEL] = 5
+		writeAudioObj.init_header(readAudioObj, 0)
+		self.assertEqual(writeAudioObj.repack(sampleNestedList), binary)
+
+
+class WavRepackTestMethods(unittest.TestCase):
+	"""
+	Methods to test the buffer contract of WavOut.repack().
+	"""
+	def test_repack_view_valid_until_next_call(self):
+		"""
+		Test that repack() returns a memoryview which the next call with
+		the same number of samples overwrites, and that a bytes() copy of
+		it stays valid.
+		"""
+		readAudioObj = wavIO.WavIn(TEST_READ_FILE)
+		readAudioObj.signalParams[baseIO.CORE_KEY_SAMPLES_PER_CHANNEL] = 2
+		writeAudioObj = wavIO.WavOut(TEST_WRITE_FILE, 'PCM', 1, 16, 44100)
+		writeAudioObj.init_header(readAudioObj, 0)
+		first = writeAudioObj.repack([[1], [2]])
+		self.assertIsInstance(first, memoryview)
+		firstCopy = bytes(first)
+		writeAudioObj.repack([[3], [4]])
+		self.assertEqual(firstCopy, b'\x01\x00\x02\x00')
+		self.assertEqual(first, b'\x03\x00\x04\x00')
+	
+	def test_repack_view_valid_until_next_call_int24(self):
+		"""
+		Test that 24-bit repack() follows the same contract as the other
+		formats.
+		"""
+		readAudioObj = wavIO.WavIn(TEST_READ_FILE)
+		readAudioObj.signalParams[baseIO.CORE_KEY_SAMPLES_PER_CHANNEL] = 2
+		writeAudioObj = wavIO.WavOut(TEST_WRITE_FILE, 'PCM', 1, 24, 44100)
+		writeAudioObj.init_header(readAudioObj, 0)
+		first = writeAudioObj.repack([[1], [-2]])
+		self.assertIsInstance(first, memoryview)
+		firstCopy = bytes(first)
+		writeAudioObj.repack([[3], [4]])
+		self.assertEqual(firstCopy, b'\x01\x00\x00\xfe\xff\xff')
+		self.assertEqual(first, b'\x03\x00\x00\x04\x00\x00')
+
+
 class CopyTestFilesTestMethods(unittest.TestCase):
 	"""
 	Methods to test WavIOEngine read and write classes by performing a simple
@@ -149,12 +236,6 @@ class CopyTestFilesTestMethods(unittest.TestCase):
 		for readFile in os.listdir(TEST_DATA_DIR):
 			with self.subTest(readFile=readFile):
 				if readFile.startswith('WAVE_'):
-					# override test of 8-bit, because it goes through
-					# unsigned -> signed -> unsigned conversion
-					if readFile == 'WAVE_PCM_2CH_44100SR_8BIT.wav':
-						continue
-					else:
-						pass
 					# Perform copy
 					readFilePath = os.path.join(TEST_DATA_DIR, readFile)
 					writeFile = readFile.split('.')[0] + '_AFTER.wav'